@@ -1,7 +1,10 @@
 import customtkinter as ctk
+import tkinter as tk
 import serial
+import logging
 import threading
 import time
+import queue
 import sqlite3
 import csv
 import speech_recognition as sr 
@@ -10,17 +13,55 @@ import asyncio
 import edge_tts
 import os
 import random 
-from sklearn.svm import SVR
-from sklearn.pipeline import make_pipeline
-from sklearn.preprocessing import StandardScaler
-from datetime import datetime
+import re
+from collections import deque
+from contextlib import closing
+from functools import lru_cache
+import numpy as np
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
+log = logging.getLogger("envirocontrol")
+
 # --- SYSTEM CONFIGURATION ---
 SERIAL_PORT = 'COM7'  # <--- CHECK YOUR PORT
 BAUD_RATE = 9600
+SERIAL_TIMEOUT = 0.5  # Max seconds a blocking read waits (bounds shutdown latency)
+SERIAL_RX_LIMIT = 4096  # Max bytes buffered without a newline before discarding
+SERIAL_BACKLOG = 4096  # A burst larger than this is stale: keep only its newest line
+SERIAL_OS_BUFFER = 65536  # Driver RX buffer request (Windows only)
+FAN_RESEND_INTERVAL = 5.0  # Re-send an unchanged fan command after this many seconds
 DB_NAME = 'smart_home_data.db'
+DB_BATCH_SIZE = 32  # Max rows committed per SQLite transaction
+DB_FLUSH_INTERVAL = 2.0  # Max seconds a queued reading waits before commit
+DB_CHECKPOINT_INTERVAL = 30.0  # Min seconds between idle WAL checkpoints by the writer
+DB_QUEUE_MAX = 10000  # Readings buffered for a stalled disk (~80 min at 2 Hz) before dropping
+# Fixed SQL text so sqlite3's statement cache reuses the prepared statement.
+# Deliberately no secondary indexes: each append touches only the rowid B-tree.
+# Build any index for offline analysis after logging, not on the live table.
+CREATE_TABLE_SQL = 'CREATE TABLE IF NOT EXISTS sensor_data (id INTEGER PRIMARY KEY, timestamp DATETIME, temp REAL, humid REAL, light INTEGER)'
+INSERT_SQL = "INSERT INTO sensor_data (timestamp, temp, humid, light) VALUES (?,?,?,?)"
+CHART_WINDOW = 60  # Samples kept for the charts and rolling averages
+GRAPH_REFRESH_MS = 500  # Chart redraw period (<= 2 Hz, independent of sample rate)
+UI_REFRESH_MS = 200  # Card/label refresh period (<= 5 Hz, independent of sample rate)
+
+@lru_cache(maxsize=8)
+def clock_label(second):
+    """Format an integer Unix second as local "HH:MM:SS".
+
+    Readings arrive ~2 per second, so consecutive calls mostly hit the cache
+    and `strftime` runs about once per second rather than once per reading.
+    """
+    return time.strftime('%H:%M:%S', time.localtime(second))
+
+def is_decimal(field):
+    """True if a serial field (bytes) looks like "[-]digits[.digits]".
+
+    A cheap pre-check before `float()`: rejects noise without raising, and
+    also rejects the "nan" Node A prints when the DHT11 read fails (which
+    `float()` would happily accept).
+    """
+    return field.replace(b'.', b'', 1).lstrip(b'-').isdigit()
 
 # --- ALFRED PERSONALITY DATABASE ---
 AUDIO_CACHE = {
@@ -43,6 +84,12 @@ AUDIO_CACHE = {
     "scene_sleep": ["Sleep Protocol initiated. Goodnight, sir."]
 }
 
+# --- VOICE COMMAND KEYWORDS ---
+# Single-pass keyword scan. Matches are anchored at a word start, so
+# "lights"/"thanks"/"warmer" hit their stem while "shot" no longer hits "hot".
+COMMAND_RE = re.compile(r"\b(hot|warm|cold|freezing|study|cinema|movie|sleep|fan|auto|light|lamp|on\b|off\b|hello|thank|who\b|status|shut down)")
+COMMAND_ALIASES = {"warm": "hot", "freezing": "cold", "movie": "cinema", "lamp": "light"}
+
 # --- COLORS ---
 COLOR_BG = "#0F172A"       
 COLOR_SIDEBAR = "#1E293B"  
@@ -69,17 +116,23 @@ class SmartHomeApp(ctk.CTk):
                 - `manual_override_status`: indicates manual fan override intent.
                 - `voice_mode`: "WAKE" (wake word) vs "CMD" (command capture).
                 - `running`: global loop flag to stop threads on exit.
+            - Opening the SQLite log via `setup_database` and creating `_db_q`,
+              the queue of readings consumed by the `_db_writer` thread (keeps
+              SQLite off the serial hot path).
             - Initializing “adaptive” control parameters:
                 - `current_threshold`: learned temperature setpoint used by the
                   hysteresis controller in `serial_loop`.
                 - `hysteresis`: deadband to reduce frequent fan toggling.
             - Initializing audio (pygame) and local TTS cache storage.
             - Building the UI via `setup_sidebar` and `setup_main_area`.
-            - Starting background threads for serial I/O, voice, and TTS caching.
+            - Starting background threads for serial I/O, DB writes, voice,
+              and TTS caching, plus the `poll_readings` / `refresh_graphs`
+              UI timers.
 
         Threading notes:
             Tkinter widgets should be updated on the UI thread. This app uses
-            `self.after(...)` for safe UI updates from background threads.
+            `self.after(...)` for safe UI updates from background threads;
+            sensor readings reach the UI through `_ui_q` + `poll_readings`.
         """
         super().__init__()
         self.title("EnviroControl AI | Adaptive Edition")
@@ -88,11 +141,22 @@ class SmartHomeApp(ctk.CTk):
         self.grid_columnconfigure(1, weight=1)
         self.grid_rowconfigure(0, weight=1)
 
+        # Fixed energy gate instead of per-session adjust_for_ambient_noise
+        # calibration, so opening the microphone costs no listening time.
         self.recognizer = sr.Recognizer()
+        self.recognizer.energy_threshold = 200  
+        self.recognizer.dynamic_energy_threshold = False 
+        self.recognizer.pause_threshold = 0.5 
         self.ai_enabled = True 
         self.manual_override_status = "None"
         self.voice_mode = "WAKE" 
         self.running = True 
+        self.setup_database()
+        self._db_q = queue.Queue(maxsize=DB_QUEUE_MAX)
+        self._db_dropped = 0  # Readings not logged because `_db_q` was full
+        self._fan_cmd = None  # Last fan byte sent (b'P'/b'N'); None = unknown
+        self._fan_sent_at = 0.0  # time.monotonic() of that write
+        self._online = False  # Status pill already shows SYSTEM ONLINE
         
         # --- ADAPTIVE BRAIN SETTINGS ---
         self.current_threshold = 27.0 
@@ -102,7 +166,18 @@ class SmartHomeApp(ctk.CTk):
         self.cached_files = {} 
         pygame.mixer.init()
 
-        self.x_data = []; self.y_temp = []; self.y_hum = []; self.y_light = []   
+        # Chart buffers: readings in fixed-size NumPy ring buffers
+        # (`_buf_head` = next write slot, `_buf_n` = fill level).
+        self.y_temp = np.zeros(CHART_WINDOW); self.y_hum = np.zeros(CHART_WINDOW); self.y_light = np.zeros(CHART_WINDOW)
+        self._buf_head = 0; self._buf_n = 0
+        self._x_idx = np.arange(CHART_WINDOW, dtype=float)  # Fixed chart x coords (one per slot)
+        self._pending_labels = {}  # widget -> configure() options, see set_label
+        self._shown_labels = {}  # widget -> options last applied by _flush_labels
+        self._graphs_dirty = False  # New samples since the last chart redraw
+        # Readings handed from the serial thread to the Tk thread. Older than a
+        # chart window would be evicted on arrival anyway, hence the bound.
+        self._ui_q = deque(maxlen=CHART_WINDOW)
+        self._labels_flush_scheduled = False
         self.last_update_time = None
         self.last_heard = "—"
         self.last_action = "—"
@@ -111,9 +186,32 @@ class SmartHomeApp(ctk.CTk):
         self.setup_main_area()
 
         # Start Threads
-        threading.Thread(target=self.serial_loop, daemon=True).start()
+        self._db_thread = threading.Thread(target=self._db_writer, daemon=True)
+        self._db_thread.start()
+        self._serial_thread = threading.Thread(target=self.serial_loop, daemon=True)
+        self._serial_thread.start()
         threading.Thread(target=self.unified_voice_loop, daemon=True).start()
         threading.Thread(target=self.preload_audio_cache, daemon=True).start()
+        self.after(UI_REFRESH_MS, self.poll_readings)
+        self.after(GRAPH_REFRESH_MS, self.refresh_graphs)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        """Stop the worker loops, flush pending readings, and close the window.
+
+        Clears `running`, then waits for `serial_loop` to finish its current
+        read (at most `SERIAL_TIMEOUT`) and close the port, so no reading is
+        queued after the shutdown sentinel. Then wakes `_db_writer` with a
+        `None` sentinel and waits (bounded) for it to commit its last batch
+        and close the connection, so closing the window never loses the
+        readings still being batched.
+        """
+        self.running = False
+        self._serial_thread.join(timeout=SERIAL_TIMEOUT + 0.1)
+        try: self._db_q.put(None, timeout=5)
+        except queue.Full: log.error("DB writer stalled; %d queued readings not saved", self._db_q.qsize())
+        self._db_thread.join(timeout=5)
+        self.destroy()
 
     def setup_sidebar(self):
         """Create the left sidebar (status, mode, voice, threshold, export).
@@ -170,6 +268,16 @@ class SmartHomeApp(ctk.CTk):
         self.btn_export = ctk.CTkButton(self.sidebar, text="💾 SAVE DATA", command=self.export_csv, fg_color=COLOR_CARD, hover_color=COLOR_PRIMARY, text_color="white", height=40)
         self.btn_export.grid(row=11, column=0, padx=20, pady=30, sticky="ew")
 
+    def configure_later(self, widget, **options):
+        """Apply `widget.configure(**options)` on the Tk thread.
+
+        Threading:
+            Safe to call from any thread; the serial and voice threads must
+            use this instead of calling `configure` directly.
+        """
+        try: self.after(0, lambda: widget.configure(**options))
+        except (RuntimeError, tk.TclError): pass  # Window already closed
+
     def update_jarvis_feed(self, heard=None, action=None):
         """Update the sidebar JARVIS FEED labels in a thread-safe way.
 
@@ -187,7 +295,7 @@ class SmartHomeApp(ctk.CTk):
             if action is not None:
                 if hasattr(self, "lbl_action"): self.lbl_action.configure(text=f"Action: {action}")
         try: self.after(0, _do)
-        except: pass
+        except (RuntimeError, tk.TclError): pass  # Window already closed
 
     def safe_ser_write(self, data: bytes):
         """Safely write a command byte to the Arduino serial port.
@@ -200,16 +308,37 @@ class SmartHomeApp(ctk.CTk):
             bool: True if the write was attempted successfully, else False.
 
         Notes:
-            This is best-effort and intentionally swallows exceptions so voice
-            and UI flows don't crash when serial isn't connected.
+            This is best-effort so voice and UI flows don't crash when serial
+            isn't connected; write failures are logged, not raised.
         """
         try:
             if hasattr(self, "ser") and self.ser is not None:
                 self.ser.write(data)
+                if data in (b'P', b'N', b'A'):
+                    self._fan_cmd = b'P' if data == b'P' else b'N'; self._fan_sent_at = time.monotonic()
                 return True
-        except: pass
+        except serial.SerialException as e:
+            log.warning("Serial write %r failed: %s", data, e)
         return False
 
+    def set_fan(self, data: bytes):
+        """Send a fan command when it changes the fan state, or as a refresh.
+
+        Args:
+            data: `b'P'` (fan ON) or `b'N'` (fan OFF).
+
+        Notes:
+            `serial_loop` evaluates fan control on every sample. Writing on
+            transitions keeps the UART quiet while the state is stable, but
+            Node A's SoftwareSerial can miss a byte while it is transmitting
+            or reading the DHT, so an unchanged command is still re-sent every
+            `FAN_RESEND_INTERVAL` seconds to correct a lost one.
+            Voice commands still go through `safe_ser_write` directly, which
+            records the fan state they set.
+        """
+        if data != self._fan_cmd or time.monotonic() - self._fan_sent_at >= FAN_RESEND_INTERVAL:
+            self.safe_ser_write(data)
+
     def setup_main_area(self):
         """Create and lay out the main dashboard area.
 
@@ -222,7 +351,7 @@ class SmartHomeApp(ctk.CTk):
             Creates widget attributes updated by `update_dashboard`:
                 - `card_temp`, `card_hum`, `card_light`, `card_fan`
                 - `mini_*` labels/bars, `lbl_last_update`, `lbl_points`
-                - `ax_*`, `canvas_*`
+                - `graph_*` chart state dicts (see `create_graph`)
         """
         self.main_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.main_frame.grid(row=0, column=1, padx=30, pady=30, sticky="nsew")
@@ -253,9 +382,10 @@ class SmartHomeApp(ctk.CTk):
         self.tab_view = ctk.CTkTabview(self.main_frame, fg_color=COLOR_SIDEBAR, segmented_button_fg_color=COLOR_BG, segmented_button_selected_color=COLOR_PRIMARY, segmented_button_selected_hover_color=COLOR_PRIMARY, corner_radius=15, height=500)
         self.tab_view.grid(row=2, column=0, columnspan=4, padx=0, pady=30, sticky="nsew")
         
-        self.ax_temp, self.canvas_temp = self.create_graph(self.tab_view.add(" TEMPERATURE "), COLOR_DANGER)
-        self.ax_hum, self.canvas_hum = self.create_graph(self.tab_view.add(" HUMIDITY "), COLOR_PRIMARY)
-        self.ax_light, self.canvas_light = self.create_graph(self.tab_view.add(" LIGHT "), COLOR_WARNING)
+        # Fixed y ranges = the sensors' output ranges (DHT11 0-50 °C / 20-90 %, 10-bit ADC)
+        self.graph_temp = self.create_graph(self.tab_view.add(" TEMPERATURE "), COLOR_DANGER, (0, 50))
+        self.graph_hum = self.create_graph(self.tab_view.add(" HUMIDITY "), COLOR_PRIMARY, (0, 100))
+        self.graph_light = self.create_graph(self.tab_view.add(" LIGHT "), COLOR_WARNING, (0, 1023))
 
     def create_hero_card(self, col, title, value, icon, color):
         """Create a hero metric card (large value + label).
@@ -300,28 +430,57 @@ class SmartHomeApp(ctk.CTk):
         bar.pack(pady=(0, 14), padx=16, fill="x")
         return value_lbl, bar
 
-    def create_graph(self, parent, color):
+    def create_graph(self, parent, color, ylim):
         """Create a Matplotlib graph embedded in a CustomTkinter tab.
 
         Args:
             parent: Tab/frame to host the graph widget.
             color: Series line color.
+            ylim: Fixed (bottom, top) y-axis range for the series.
 
         Returns:
-            Tuple (ax, canvas) used by `update_single_graph` to redraw.
+            Dict with the chart's `fig`, `ax`, `canvas`, `line` and `fill`
+            artists, the preallocated plot arrays `y` (one slot per x,
+            NaN = no sample yet) and `verts` (fill polygon, x prefilled),
+            plus the cached background `bg` used by `update_single_graph`.
+
+        Rendering:
+            All static styling (colors, spines, grid, ticks) and both axis
+            limits are fixed here: x spans the last `CHART_WINDOW` samples
+            with the newest at the right edge ("now"). The line and fill are
+            `animated`, so a full draw renders only the static background;
+            the `draw_event` hook caches that background and paints the data
+            on top, and the `resize_event` hook drops it so nothing is blitted
+            over a background of the old size. Since nothing in the background ever
+            changes with the data, every update can be blitted.
         """
         fig = Figure(figsize=(5, 3), dpi=100)
         fig.patch.set_facecolor(COLOR_SIDEBAR) 
         ax = fig.add_subplot(111)
         ax.set_facecolor(COLOR_SIDEBAR) 
         ax.tick_params(colors=COLOR_SUBTEXT, labelsize=9)
+        ax.tick_params(axis='x', labelsize=8)
         ax.spines['bottom'].set_color(COLOR_SUBTEXT); ax.spines['left'].set_color(COLOR_SUBTEXT)
         ax.spines['top'].set_visible(False); ax.spines['right'].set_visible(False)
-        ax.grid(True, color=COLOR_CARD, linestyle='-', linewidth=1, alpha=0.5)
-        ax.plot([], [], color=color, linewidth=3) 
+        ax.grid(True, color=COLOR_CARD, linestyle='-', linewidth=1, alpha=0.3)
+        ax.set_xlim(0, CHART_WINDOW - 1); ax.set_ylim(*ylim)
+        ax.set_xticks([CHART_WINDOW - 1]); ax.set_xticklabels(["now"])
+        y = np.full(CHART_WINDOW, np.nan)
+        verts = np.zeros((2 * CHART_WINDOW, 2)); verts[:, 0] = np.r_[self._x_idx, self._x_idx[::-1]]
+        line, = ax.plot(self._x_idx, y, color=color, linewidth=2.5, animated=True) 
+        fill = ax.fill_between([0], [0], color=color, alpha=0.1, animated=True)
         canvas = FigureCanvasTkAgg(fig, master=parent)
         canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
-        return ax, canvas
+        graph = {"fig": fig, "ax": ax, "canvas": canvas, "line": line, "fill": fill, "y": y, "verts": verts, "bg": None}
+        canvas.mpl_connect("draw_event", lambda event: self._on_graph_draw(graph))
+        # A resize invalidates the cached background until the next full draw
+        canvas.mpl_connect("resize_event", lambda event: graph.__setitem__("bg", None))
+        return graph
+
+    def _on_graph_draw(self, graph):
+        """Cache the freshly drawn background and paint the animated artists."""
+        graph["bg"] = graph["canvas"].copy_from_bbox(graph["fig"].bbox)
+        graph["ax"].draw_artist(graph["fill"]); graph["ax"].draw_artist(graph["line"])
 
     def preload_audio_cache(self):
         """Preload TTS audio responses into local MP3 files.
@@ -349,7 +508,8 @@ class SmartHomeApp(ctk.CTk):
                     try:
                         communicate = edge_tts.Communicate(text, voice)
                         loop.run_until_complete(communicate.save(filename))
-                    except: pass
+                    except Exception as e:
+                        log.warning("Could not cache %s: %s", filename, e)
                 self.cached_files[category].append(filename)
         self.speak_quick("wake") 
 
@@ -360,13 +520,17 @@ class SmartHomeApp(ctk.CTk):
             category: Category name in `self.cached_files`.
 
         Notes:
-            - Best-effort: playback failures are silently ignored.
+            - Best-effort: playback failures (e.g. a phrase that failed to
+              cache) are logged and otherwise ignored; a category with no
+              cached files yet (preload still running) plays nothing.
         """
+        files = self.cached_files.get(category)
+        if not files: return  # Unknown category, or still being cached by preload_audio_cache
         try:
-            if category in self.cached_files:
-                pygame.mixer.music.load(random.choice(self.cached_files[category]))
-                pygame.mixer.music.play()
-        except: pass
+            pygame.mixer.music.load(random.choice(files))
+            pygame.mixer.music.play()
+        except pygame.error as e:
+            log.warning("Playback of '%s' failed: %s", category, e)
 
     def speak(self, text):
         """Synthesize and speak a custom sentence (non-cached).
@@ -388,12 +552,17 @@ class SmartHomeApp(ctk.CTk):
                 pygame.mixer.music.load("temp.mp3"); pygame.mixer.music.play()
                 while pygame.mixer.music.get_busy(): time.sleep(0.1)
                 pygame.mixer.music.unload(); os.remove("temp.mp3")
-            except: pass
+            except Exception as e:
+                log.warning("Speech synthesis failed: %s", e)
         threading.Thread(target=_speak, daemon=True).start()
 
     def update_threshold_ui(self):
-        """Update the sidebar threshold label from `self.current_threshold`."""
-        self.lbl_threshold.configure(text=f"{self.current_threshold:.1f} °C")
+        """Update the sidebar threshold label from `self.current_threshold`.
+
+        Threading:
+            Safe to call from any thread (used by the voice loop).
+        """
+        self.configure_later(self.lbl_threshold, text=f"{self.current_threshold:.1f} °C")
 
     # --- VOICE LOOP (VALIDATED + ADAPTIVE) ---
     def unified_voice_loop(self):
@@ -420,25 +589,24 @@ class SmartHomeApp(ctk.CTk):
                 - shut down
 
         Threading:
-            Runs in a daemon thread. UI updates are performed indirectly via
-            `update_jarvis_feed` and widget configuration calls.
+            Runs in a daemon thread. All UI updates go through
+            `update_jarvis_feed` and `configure_later`, never direct
+            `configure` calls.
 
         Reliability:
-            The loop uses broad exception handling to stay alive even if the
-            microphone or recognition service intermittently fails.
+            Timeouts and unintelligible audio are expected and ignored; service
+            and microphone failures are logged, and the loop keeps running.
+            Microphone errors while listening (`OSError`, e.g. the device was
+            unplugged) close the stream and retry opening it every second.
         """
         time.sleep(3) 
         while self.running:
             try:
                 with sr.Microphone(device_index=1) as source:
-                    self.recognizer.energy_threshold = 200  
-                    self.recognizer.dynamic_energy_threshold = False 
-                    self.recognizer.pause_threshold = 0.5 
-                    
                     while self.running:
                         try:
                             if self.voice_mode == "WAKE":
-                                self.btn_voice.configure(text="🎙️ STANDBY...", fg_color=COLOR_ACCENT)
+                                self.configure_later(self.btn_voice, text="🎙️ STANDBY...", fg_color=COLOR_ACCENT)
                                 audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=2)
                                 phrase = self.recognizer.recognize_google(audio).lower()
                                 self.update_jarvis_feed(heard=phrase)
@@ -448,17 +616,18 @@ class SmartHomeApp(ctk.CTk):
                                     self.voice_mode = "CMD" 
                                     
                             elif self.voice_mode == "CMD":
-                                self.btn_voice.configure(text="🔴 LISTENING...", fg_color=COLOR_DANGER)
+                                self.configure_later(self.btn_voice, text="🔴 LISTENING...", fg_color=COLOR_DANGER)
                                 audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=4)
-                                self.btn_voice.configure(text="⚡ EXECUTING...", fg_color=COLOR_WARNING)
+                                self.configure_later(self.btn_voice, text="⚡ EXECUTING...", fg_color=COLOR_WARNING)
                                 command = self.recognizer.recognize_google(audio).lower()
                                 print(f"Cmd: {command}")
                                 self.update_jarvis_feed(heard=command)
 
+                                tokens = {COMMAND_ALIASES.get(w, w) for w in COMMAND_RE.findall(command)}
                                 handled = False
 
                                 # --- 1. DIRECT ADAPTATION (Contextual) ---
-                                if "hot" in command or "warm" in command:
+                                if "hot" in tokens:
                                     self.speak_quick("adjust_cool")
                                     self.current_threshold = max(18.0, self.current_threshold - 1.0) # Limit min 18
                                     self.update_threshold_ui()
@@ -466,7 +635,7 @@ class SmartHomeApp(ctk.CTk):
                                     self.update_jarvis_feed(action="Adjusted: Cooler")
                                     handled = True
 
-                                elif "cold" in command or "freezing" in command:
+                                elif "cold" in tokens:
                                     self.speak_quick("adjust_warm")
                                     self.current_threshold = min(32.0, self.current_threshold + 1.0) # Limit max 32
                                     self.update_threshold_ui()
@@ -475,42 +644,42 @@ class SmartHomeApp(ctk.CTk):
                                     handled = True
 
                                 # --- 2. SCENE MODES ---
-                                elif "study" in command:
+                                elif "study" in tokens:
                                     self.safe_ser_write(b'L') 
                                     self.ai_enabled = True 
                                     self.current_threshold = 24.0 # Focus temp
                                     self.update_threshold_ui()
-                                    self.mode_label.configure(text="📚 STUDY", text_color=COLOR_PRIMARY)
+                                    self.configure_later(self.mode_label, text="📚 STUDY", text_color=COLOR_PRIMARY)
                                     self.speak_quick("scene_study")
                                     self.update_jarvis_feed(action="Study mode")
                                     handled = True
 
-                                elif "cinema" in command or "movie" in command:
+                                elif "cinema" in tokens:
                                     self.safe_ser_write(b'l'); self.safe_ser_write(b'P') 
                                     self.ai_enabled = False 
                                     self.manual_override_status = "ON"
-                                    self.mode_label.configure(text="🎬 CINEMA", text_color=COLOR_WARNING)
+                                    self.configure_later(self.mode_label, text="🎬 CINEMA", text_color=COLOR_WARNING)
                                     self.speak_quick("scene_cinema")
                                     self.update_jarvis_feed(action="Cinema mode")
                                     handled = True
 
-                                elif "sleep" in command:
+                                elif "sleep" in tokens:
                                     self.safe_ser_write(b'l')
                                     self.ai_enabled = True 
                                     self.current_threshold = 26.0 # Sleep temp
                                     self.update_threshold_ui()
-                                    self.mode_label.configure(text="🌙 SLEEP", text_color=COLOR_ACCENT)
+                                    self.configure_later(self.mode_label, text="🌙 SLEEP", text_color=COLOR_ACCENT)
                                     self.speak_quick("scene_sleep")
                                     self.update_jarvis_feed(action="Sleep mode")
                                     handled = True
 
                                 # --- 3. HARDWARE COMMANDS ---
-                                elif "fan" in command:
-                                    if "on" in command:
+                                elif "fan" in tokens:
+                                    if "on" in tokens:
                                         self.safe_ser_write(b'P')
                                         self.ai_enabled = False
                                         self.manual_override_status = "ON"
-                                        self.mode_label.configure(text="⚡ OVERRIDE", text_color=COLOR_WARNING)
+                                        self.configure_later(self.mode_label, text="⚡ OVERRIDE", text_color=COLOR_WARNING)
                                         self.speak_quick("fan_on")
                                         self.update_jarvis_feed(action="Fan ON")
                                         handled = True
@@ -518,11 +687,11 @@ class SmartHomeApp(ctk.CTk):
                                             self.current_threshold = max(18.0, self.last_temp - 0.5)
                                             self.update_threshold_ui()
 
-                                    elif "off" in command:
+                                    elif "off" in tokens:
                                         self.safe_ser_write(b'N')
                                         self.ai_enabled = True
                                         self.manual_override_status = "None"
-                                        self.mode_label.configure(text="🤖 AUTO", text_color=COLOR_SUCCESS)
+                                        self.configure_later(self.mode_label, text="🤖 AUTO", text_color=COLOR_SUCCESS)
                                         self.speak_quick("fan_off")
                                         self.update_jarvis_feed(action="Fan OFF")
                                         handled = True
@@ -530,40 +699,40 @@ class SmartHomeApp(ctk.CTk):
                                             self.current_threshold = min(32.0, self.last_temp + 0.5)
                                             self.update_threshold_ui()
 
-                                elif "auto" in command:
+                                elif "auto" in tokens:
                                     self.safe_ser_write(b'A')
                                     self.ai_enabled = True
                                     self.manual_override_status = "None"
-                                    self.mode_label.configure(text="🤖 AUTO", text_color=COLOR_SUCCESS)
+                                    self.configure_later(self.mode_label, text="🤖 AUTO", text_color=COLOR_SUCCESS)
                                     self.speak_quick("auto")
                                     self.update_jarvis_feed(action="Auto mode")
                                     handled = True
                                 
-                                elif "light" in command or "lamp" in command:
-                                    if "on" in command:
+                                elif "light" in tokens:
+                                    if "on" in tokens:
                                         self.safe_ser_write(b'L')
                                         self.speak_quick("light_on")
                                         self.update_jarvis_feed(action="Lights ON")
                                         handled = True
-                                    elif "off" in command:
+                                    elif "off" in tokens:
                                         self.safe_ser_write(b'l')
                                         self.speak_quick("light_off")
                                         self.update_jarvis_feed(action="Lights OFF")
                                         handled = True
 
                                 # --- 4. CHAT ---
-                                elif "hello" in command:
+                                elif "hello" in tokens:
                                     self.speak_quick("greeting"); self.update_jarvis_feed(action="Greeting"); handled=True
-                                elif "thank" in command:
+                                elif "thank" in tokens:
                                     self.speak_quick("thanks"); self.update_jarvis_feed(action="You're welcome"); handled=True
-                                elif "who" in command:
+                                elif "who" in tokens:
                                     self.speak_quick("identity"); self.update_jarvis_feed(action="Identity"); handled=True
-                                elif "status" in command: 
+                                elif "status" in tokens: 
                                     self.speak_quick("confirm")
                                     self.speak(f"Current temp is {self.last_temp} degrees.")
                                     self.update_jarvis_feed(action="Status report")
                                     handled = True
-                                elif "shut down" in command:
+                                elif "shut down" in tokens:
                                     self.safe_ser_write(b'N'); time.sleep(0.1); self.safe_ser_write(b'l')
                                     self.speak("Shutting down systems.")
                                     self.update_jarvis_feed(action="Shutdown")
@@ -574,12 +743,20 @@ class SmartHomeApp(ctk.CTk):
                                     self.speak_quick("unknown")
                                     self.update_jarvis_feed(action="Unrecognized command")
 
-                                if not handled: self.btn_voice.configure(text="🎙️ STANDBY...", fg_color=COLOR_ACCENT)
+                                if not handled: self.configure_later(self.btn_voice, text="🎙️ STANDBY...", fg_color=COLOR_ACCENT)
                                 time.sleep(0.2)
                                 self.voice_mode = "WAKE"
 
-                        except: pass
-            except: time.sleep(1)
+                        except (sr.WaitTimeoutError, sr.UnknownValueError): pass  # Silence / unintelligible
+                        except sr.RequestError as e:
+                            log.warning("Speech service unavailable: %s", e)
+                        except OSError: raise  # Mic stream lost: reopen via the outer handler
+                        except Exception:
+                            log.exception("Voice command handling failed")
+                            time.sleep(1)  # Don't spin (and flood the log) on a repeating failure
+            except Exception as e:
+                log.warning("Microphone unavailable: %s", e)
+                time.sleep(1)
 
     def force_wake(self):
         """Manually switch the voice system into command mode.
@@ -596,162 +773,364 @@ class SmartHomeApp(ctk.CTk):
             - Writes `log.csv` to the current working directory.
 
         Data source:
-            - Reads all rows from the SQLite database `smart_home_data.db`.
+            - Streams all rows from the SQLite database `smart_home_data.db`
+              straight from the cursor into the CSV writer, so memory use
+              stays constant as the log grows.
 
         Failure handling:
-            Best-effort: any exception is swallowed to avoid UI disruption.
+            Best-effort: DB/file errors are logged rather than raised to avoid
+            UI disruption. The connection is closed on every path.
         """
         try:
-            conn = sqlite3.connect(DB_NAME); cursor = conn.cursor()
-            cursor.execute("SELECT * FROM sensor_data")
-            with open(f"log.csv", 'w', newline='') as f: csv.writer(f).writerows(cursor.fetchall())
+            with closing(sqlite3.connect(DB_NAME)) as conn:
+                conn.execute("PRAGMA cache_size=-20000")
+                conn.execute("PRAGMA temp_store=MEMORY")
+                conn.execute("PRAGMA mmap_size=67108864")  # Scan pages via mmap, not read()
+                with open("log.csv", 'w', newline='', buffering=1 << 20) as f:
+                    csv.writer(f).writerows(conn.execute("SELECT * FROM sensor_data"))
+        except (sqlite3.Error, OSError) as e:
+            log.error("CSV export failed: %s", e)
+
+    # --- DB WRITER (BATCHED, OFF THE SERIAL THREAD) ---
+    def setup_database(self):
+        """Open the long-lived logging connection and prepare the schema.
+
+        Runs once at startup, before any thread touches the DB:
+            - Opens `self.db_conn` in autocommit mode (transactions are
+              explicit in `_commit_batch`) with `check_same_thread=False`,
+              since it is created here but used only by `_db_writer`.
+            - Enables WAL journaling with `synchronous=NORMAL` so each commit
+              costs one fsync and `export_csv` can read while we write, plus
+              a 4 MiB page cache and in-memory temp storage.
+            - Raises `wal_autocheckpoint` to 10000 pages so SQLite's own
+              checkpoint (run inside a COMMIT) is only a fallback; the writer
+              checkpoints the WAL itself while idle (see `_db_writer`).
+            - Ensures the `sensor_data` table exists.
+        """
+        self.db_conn = sqlite3.connect(DB_NAME, isolation_level=None, check_same_thread=False)
+        self.db_conn.execute("PRAGMA journal_mode=WAL")
+        self.db_conn.execute("PRAGMA synchronous=NORMAL")
+        self.db_conn.execute("PRAGMA wal_autocheckpoint=10000")
+        self.db_conn.execute("PRAGMA temp_store=MEMORY")
+        self.db_conn.execute("PRAGMA cache_size=-4096")
+        self.db_conn.execute(CREATE_TABLE_SQL)
+
+    def _db_writer(self):
+        """Persist queued readings to SQLite in batched transactions.
+
+        Sole user of `self.db_conn` (see `setup_database`):
+            - Accumulates readings from `_db_q` and commits them in one
+              transaction once `DB_BATCH_SIZE` rows are pending or the oldest
+              pending row is `DB_FLUSH_INTERVAL` seconds old.
+            - After a commit that leaves `_db_q` empty, runs a PASSIVE WAL
+              checkpoint if the last one is `DB_CHECKPOINT_INTERVAL` seconds
+              old, so the WAL is folded back in the idle gap between batches
+              instead of by an autocheckpoint on the commit path.
+            - On the `None` sentinel from `on_close`, commits whatever is
+              still pending and closes the connection.
+
+        Threading:
+            Runs in a daemon thread. `serial_loop` only enqueues tuples of
+            (unix_time, temp, humid, light); timestamps are formatted to the
+            stored HH:MM:SS text here, once per batch.
+        """
+        conn = self.db_conn
+        batch = []
+        deadline = None  # Flush time for the current batch (monotonic clock)
+        next_checkpoint = time.monotonic() + DB_CHECKPOINT_INTERVAL
+        try:
+            while True:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self._db_q.get(timeout=timeout)
+                    if item is None: break  # Shutdown sentinel
+                    batch.append(item)
+                    if deadline is None: deadline = time.monotonic() + DB_FLUSH_INTERVAL
+                except queue.Empty: pass
+                if batch and (len(batch) >= DB_BATCH_SIZE or time.monotonic() >= deadline):
+                    self._commit_batch(conn, batch)
+                    batch = []; deadline = None
+                    if self._db_q.empty() and time.monotonic() >= next_checkpoint:
+                        try: conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+                        except sqlite3.Error as e: log.warning("WAL checkpoint failed: %s", e)
+                        next_checkpoint = time.monotonic() + DB_CHECKPOINT_INTERVAL
+        finally:
+            if batch: self._commit_batch(conn, batch)
             conn.close()
-        except: pass
+
+    def _commit_batch(self, conn, batch):
+        """Insert `batch` inside one explicit transaction (one fsync in WAL)."""
+        rows = [(clock_label(int(ts)), t, h, l) for ts, t, h, l in batch]
+        try:
+            conn.execute("BEGIN")
+            conn.executemany(INSERT_SQL, rows)
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            log.error("Dropped %d readings, DB write failed: %s", len(batch), e)
+            if conn.in_transaction: conn.execute("ROLLBACK")
 
     # --- SERIAL LOOP WITH HYSTERESIS & ADAPTIVE LOGIC ---
     def serial_loop(self):
-        """Continuously read serial telemetry, log it to SQLite, and update UI.
+        """Continuously read serial telemetry and hand each reading off.
 
         Responsibilities:
-            - Ensure the `sensor_data` table exists.
             - Connect to the configured serial port (`SERIAL_PORT`).
-            - Parse incoming lines as CSV: temp, humid, light.
-            - Persist readings to SQLite with a timestamp.
-            - Update connection status indicator.
-            - Apply fan control:
-                - In AI mode: hysteresis control around `current_threshold`.
-                - In manual override: can force fan ON.
-            - Schedule UI refresh using `self.after(0, ...)`.
+            - Block in `read` until at least one byte arrives (or
+              `SERIAL_TIMEOUT` passes), taking everything already waiting in
+              the same call. Bytes go into the `_rx_buf` bytearray; complete
+              lines are split off and the trailing partial line (bounded by
+              `SERIAL_RX_LIMIT`) is kept for the next pass.
+            - If a single burst exceeds `SERIAL_BACKLOG` bytes the reader has
+              fallen behind; only the newest line is processed so control and
+              display catch up immediately instead of replaying stale data.
+            - Parse each line (bytes, no decode) as CSV: temp, humid, light,
+              and pass valid readings to `handle_reading`. Fields are checked
+              with `is_decimal` first, so noise and failed DHT reads ("nan")
+              are skipped without raising.
+            - Idle waiting happens in the serial driver, not a poll loop, so
+              the thread uses no CPU between samples.
+            - On open failure or a lost link, log it and show
+              "ERROR: <port>" in the status pill.
 
         Threading:
             Runs in a daemon thread.
         """
-        conn = sqlite3.connect(DB_NAME)
-        conn.execute('CREATE TABLE IF NOT EXISTS sensor_data (id INTEGER PRIMARY KEY, timestamp DATETIME, temp REAL, humid REAL, light INTEGER)')
-        conn.close()
-        try: self.ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
-        except: return
-
+        try: self.ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=SERIAL_TIMEOUT)
+        except serial.SerialException as e:
+            log.error("Cannot open %s: %s", SERIAL_PORT, e)
+            self.configure_later(self.status_label, text=f"● ERROR: {SERIAL_PORT}", text_color=COLOR_DANGER)
+            return
+        if hasattr(self.ser, "set_buffer_size"):  # Only pyserial's Windows backend
+            self.ser.set_buffer_size(rx_size=SERIAL_OS_BUFFER)
+
+        # Hot loop: bind the per-iteration lookups to locals once.
+        ser = self.ser; read = ser.read; handle = self.handle_reading
+        buf = self._rx_buf = bytearray()
         while self.running:
-            if self.ser.in_waiting:
-                try:
-                    line = self.ser.readline().decode().strip()
-                    parts = line.split(',')
-                    if len(parts) == 3:
-                        t, h, l = parts
-                        self.last_temp = float(t) 
-                        
-                        conn = sqlite3.connect(DB_NAME)
-                        conn.execute("INSERT INTO sensor_data (timestamp, temp, humid, light) VALUES (?,?,?,?)", (datetime.now().strftime('%H:%M:%S'), t, h, l))
-                        conn.commit(); conn.close()
-                        
-                        self.status_label.configure(text="● SYSTEM ONLINE", text_color=COLOR_SUCCESS)
-
-                        # --- HYSTERESIS PROTECTION (Prevents fan flicker) ---
-                        if self.ai_enabled:
-                            # Turn ON if significantly hotter than threshold
-                            if self.last_temp > (self.current_threshold + self.hysteresis):
-                                self.safe_ser_write(b'P')
-                            # Turn OFF if significantly cooler than threshold
-                            elif self.last_temp < (self.current_threshold - self.hysteresis):
-                                self.safe_ser_write(b'N') 
-                            # If in between, do NOTHING (keep previous state)
-                        else:
-                             if self.manual_override_status == "ON": self.safe_ser_write(b'P')
-                        
-                        self.after(0, self.update_dashboard, t, h, l)
-                except: pass
-
-    def update_dashboard(self, t, h, l):
+            try:
+                # Block in the driver until data arrives, then take the whole burst.
+                data = read(ser.in_waiting or 1)
+            except serial.SerialException as e:
+                log.error("Serial link lost: %s", e)
+                self.configure_later(self.status_label, text=f"● ERROR: {SERIAL_PORT}", text_color=COLOR_DANGER)
+                return
+            if not data: continue  # Timed out; re-check self.running
+            buf += data
+            end = buf.rfind(b'\n')
+            if end < 0:
+                if len(buf) > SERIAL_RX_LIMIT:
+                    log.warning("Discarding %d bytes without a line break", len(buf))
+                    buf.clear()
+                continue
+            lines = buf[:end].split(b'\n')
+            del buf[:end + 1]  # Keep only the partial tail, in place
+            if len(data) > SERIAL_BACKLOG:
+                log.warning("Serial backlog of %d bytes, dropping %d stale lines", len(data), len(lines) - 1)
+                lines = lines[-1:]
+            for line in lines:
+                if line.count(b',') != 2: continue  # Banner/noise: skip before splitting
+                parts = line.rstrip().split(b',')
+                if not all(map(is_decimal, parts)):
+                    log.debug("Skipping non-numeric line: %r", line)
+                    continue
+                try: reading = float(parts[0]), float(parts[1]), int(parts[2])
+                except ValueError:
+                    log.debug("Skipping malformed line: %r", line)
+                    continue
+                try: handle(*reading)
+                except Exception:
+                    log.exception("Failed to handle reading %r", reading)
+        ser.close()
+
+    def handle_reading(self, t, h, l):
+        """Log one parsed reading, apply fan control, and schedule a UI refresh.
+
+        Args:
+            t: Temperature in °C.
+            h: Relative humidity in %.
+            l: Raw LDR ADC value (0-1023).
+
+        Side effects:
+            - Queues the reading with a timestamp for `_db_writer` (dropped,
+              with a warning, if `DB_QUEUE_MAX` readings are already waiting).
+            - Flips the connection status indicator to ONLINE (first reading
+              only; it is not re-configured per sample).
+            - Applies fan control:
+                - In AI mode: hysteresis control around `current_threshold`.
+                - In manual override: can force fan ON.
+            - Hands the reading to the UI via `_ui_q` (see `poll_readings`).
+        """
+        self.last_temp = t
+
+        ts = time.time()  # Raw capture time; formatted off this thread (see clock_label)
+        try: self._db_q.put_nowait((ts, t, h, l))
+        except queue.Full:  # Disk stalled: never block serial reads on it
+            self._db_dropped += 1
+            if self._db_dropped % 100 == 1: log.warning("DB queue full, %d readings dropped so far", self._db_dropped)
+
+        if not self._online:
+            self.configure_later(self.status_label, text="● SYSTEM ONLINE", text_color=COLOR_SUCCESS)
+            self._online = True
+
+        # --- HYSTERESIS PROTECTION (Prevents fan flicker) ---
+        if self.ai_enabled:
+            # Turn ON if significantly hotter than threshold
+            if self.last_temp > (self.current_threshold + self.hysteresis):
+                self.set_fan(b'P')
+            # Turn OFF if significantly cooler than threshold
+            elif self.last_temp < (self.current_threshold - self.hysteresis):
+                self.set_fan(b'N') 
+            # If in between, do NOTHING (keep previous state)
+        else:
+             if self.manual_override_status == "ON": self.set_fan(b'P')
+
+        self._ui_q.append((ts, t, h, l))
+
+    def poll_readings(self):
+        """Apply readings queued by the serial thread, then re-arm the timer.
+
+        Runs every `UI_REFRESH_MS` on the Tk thread instead of one `after(0)`
+        callback per reading, so a burst of readings becomes one pass: every
+        sample still lands in the chart buffers, while `set_label` collapses
+        the label updates into one `configure` per widget.
+        """
+        while self._ui_q:
+            self.update_dashboard(*self._ui_q.popleft())
+        self.after(UI_REFRESH_MS, self.poll_readings)
+
+    def update_dashboard(self, ts, t, h, l):
         """Update all dashboard widgets with new sensor readings.
 
         Args:
-            t: Temperature value (string or numeric).
-            h: Humidity value (string or numeric).
-            l: Light sensor reading (string or numeric).
+            ts: Reading capture time (Unix seconds), as queued for the DB.
+            t: Temperature in °C (float).
+            h: Relative humidity in % (float).
+            l: Raw LDR ADC value, 0-1023 (int).
 
         Side effects:
-            - Updates hero card labels.
+            - Queues hero card / insight label text via `set_label` (which
+              skips text the labels already show).
             - Updates fan status label based on mode/override.
-            - Appends to chart buffers (keeps last 60 points).
+            - Writes into the chart ring buffers (keeps last `CHART_WINDOW`).
             - Updates insight averages and progress bars.
-            - Redraws all charts.
+            - Marks the charts dirty for the next `refresh_graphs` tick.
         """
-        self.card_temp.configure(text=f"{t} °C")
-        self.card_hum.configure(text=f"{h} %")
-        self.card_light.configure(text=f"{l}")
+        self.set_label(self.card_temp, text=f"{t} °C")
+        self.set_label(self.card_hum, text=f"{h} %")
+        self.set_label(self.card_light, text=f"{l}")
 
         if self.ai_enabled:
-            self.card_fan.configure(text="AUTO", text_color=COLOR_SUCCESS)
+            self.set_label(self.card_fan, text="AUTO", text_color=COLOR_SUCCESS)
         else:
             if self.manual_override_status == "ON":
-                self.card_fan.configure(text="ON", text_color=COLOR_WARNING)
+                self.set_label(self.card_fan, text="ON", text_color=COLOR_WARNING)
             else:
-                self.card_fan.configure(text="MANUAL", text_color=COLOR_WARNING)
+                self.set_label(self.card_fan, text="MANUAL", text_color=COLOR_WARNING)
 
-        self.x_data.append(datetime.now().strftime('%H:%M:%S'))
-        self.y_temp.append(float(t)); self.y_hum.append(float(h)); self.y_light.append(int(l))
-        if len(self.x_data) > 60: 
-            self.x_data.pop(0); self.y_temp.pop(0); self.y_hum.pop(0); self.y_light.pop(0)
+        i = self._buf_head
+        self.y_temp[i] = t; self.y_hum[i] = h; self.y_light[i] = l
+        self._buf_head = (i + 1) % CHART_WINDOW
+        self._buf_n = min(self._buf_n + 1, CHART_WINDOW)
 
         # Mini insights
         def _clamp01(v):
             try: return max(0.0, min(1.0, float(v)))
-            except: return 0.0
-        def _avg(values): return (sum(values) / len(values)) if values else 0.0
+            except (TypeError, ValueError): return 0.0
 
-        avg_t = _avg(self.y_temp); avg_h = _avg(self.y_hum); avg_l = _avg(self.y_light)
+        n = self._buf_n
+        avg_t = self.y_temp[:n].mean(); avg_h = self.y_hum[:n].mean(); avg_l = self.y_light[:n].mean()
 
-        self.mini_temp_lbl.configure(text=f"{avg_t:.1f} °C")
-        self.mini_hum_lbl.configure(text=f"{avg_h:.1f} %")
-        self.mini_light_lbl.configure(text=f"{avg_l:.0f}")
+        self.set_label(self.mini_temp_lbl, text=f"{avg_t:.1f} °C")
+        self.set_label(self.mini_hum_lbl, text=f"{avg_h:.1f} %")
+        self.set_label(self.mini_light_lbl, text=f"{avg_l:.0f}")
 
         self.mini_temp_bar.set(_clamp01(avg_t / 50.0))
         self.mini_hum_bar.set(_clamp01(avg_h / 100.0))
         self.mini_light_bar.set(_clamp01(avg_l / 1023.0))
 
-        self.last_update_time = self.x_data[-1] if self.x_data else None
-        self.lbl_last_update.configure(text=f"Last: {self.last_update_time or '--:--:--'}")
-        self.lbl_points.configure(text=f"Points: {len(self.x_data)}")
+        self.last_update_time = clock_label(int(ts))
+        self.set_label(self.lbl_last_update, text=f"Last: {self.last_update_time}")
+        self.set_label(self.lbl_points, text=f"Points: {n}")
+        self._graphs_dirty = True
 
-        self.update_single_graph(self.ax_temp, self.canvas_temp, self.y_temp, COLOR_DANGER)
-        self.update_single_graph(self.ax_hum, self.canvas_hum, self.y_hum, COLOR_PRIMARY)
-        self.update_single_graph(self.ax_light, self.canvas_light, self.y_light, COLOR_WARNING)
+    def refresh_graphs(self):
+        """Redraw the charts if new samples arrived, then re-arm the timer.
 
-    def update_single_graph(self, ax, canvas, y, c):
-        """Redraw one chart with downsampled timestamp labels.
+        Runs every `GRAPH_REFRESH_MS` on the Tk thread, so chart rendering is
+        capped at that rate no matter how fast readings arrive; the cheap
+        card/label updates in `update_dashboard` still happen per reading.
+        """
+        if self._graphs_dirty:
+            self._graphs_dirty = False
+            self.update_single_graph(self.graph_temp, self.y_temp)
+            self.update_single_graph(self.graph_hum, self.y_hum)
+            self.update_single_graph(self.graph_light, self.y_light)
+        self.after(GRAPH_REFRESH_MS, self.refresh_graphs)
+
+    def set_label(self, widget, **options):
+        """Queue `configure(**options)` for a label; apply all queued at idle.
+
+        Repeated updates to the same widget before the flush collapse into
+        one `configure` call with the latest options, so a burst of readings
+        costs one Tk configure per label instead of one per reading. Options
+        equal to what the label already shows are dropped at flush, so a
+        stable sensor costs no Tk work at all.
+
+        Only use this for labels that are never configured directly, or the
+        shown-value cache goes stale.
+        """
+        self._pending_labels.setdefault(widget, {}).update(options)
+        if not self._labels_flush_scheduled:
+            self._labels_flush_scheduled = True
+            self.after_idle(self._flush_labels)
+
+    def _flush_labels(self):
+        """Apply every queued label update in one pass (see `set_label`)."""
+        pending, self._pending_labels = self._pending_labels, {}
+        self._labels_flush_scheduled = False
+        for widget, options in pending.items():
+            shown = self._shown_labels.setdefault(widget, {})
+            changed = {k: v for k, v in options.items() if shown.get(k) != v}
+            if changed: widget.configure(**changed); shown.update(changed)
+
+    def update_single_graph(self, graph, buf):
+        """Blit the newest samples onto one chart.
 
         Args:
-            ax: Matplotlib Axes to draw into.
-            canvas: FigureCanvasTkAgg to redraw.
-            y: Sequence of y-values.
-            c: Line color.
+            graph: Chart state dict from `create_graph`.
+            buf: The series' NumPy ring buffer (`y_temp`/`y_hum`/`y_light`).
 
         Chart details:
-            - X values are indices into the ring buffer.
-            - Tick labels are taken from `self.x_data` and reduced to ~8 ticks
-              to keep the chart readable.
+            - The ring buffer is unrolled oldest-first into the chart's own
+              `y` array with two slice copies (no per-draw allocation), and
+              handed to the line in a single `set_ydata`; x never changes.
+              The series is right-aligned: the newest sample sits at
+              x = `CHART_WINDOW` - 1, and slots with no sample yet stay NaN
+              (not drawn).
+            - The fill reuses the same values via the `verts` array; only the
+              filled part of it is passed to `set_verts`.
+            - The axes limits and ticks never change, so the data is always
+              blitted over the cached background.
+            - Until that background exists (first show, or right after a
+              resize) a full redraw is requested with `draw_idle` instead;
+              its `draw_event` re-caches the background.
         """
-        ax.clear(); ax.set_facecolor(COLOR_SIDEBAR)
-        ax.grid(True, color=COLOR_CARD, linestyle='-', linewidth=1, alpha=0.3)
-        n = len(self.x_data)
-        x = list(range(n))
-        ax.plot(x, y, color=c, linewidth=2.5)
-        ax.fill_between(x, y, color=c, alpha=0.1)
-        if n > 0:
-            target_ticks = 8
-            if n <= target_ticks: idxs = list(range(n))
-            else:
-                step = max(1, n // (target_ticks - 1))
-                idxs = list(range(0, n, step))
-                if idxs[-1] != n - 1: idxs.append(n - 1)
-            labels = [self.x_data[i] for i in idxs]
-            ax.set_xticks(idxs)
-            ax.set_xticklabels(labels, rotation=0, ha='center', fontsize=8, color=COLOR_SUBTEXT)
-        ax.spines['bottom'].set_color(COLOR_SUBTEXT); ax.spines['left'].set_color(COLOR_SUBTEXT)
-        ax.spines['top'].set_visible(False); ax.spines['right'].set_visible(False); ax.tick_params(colors=COLOR_SUBTEXT)
-        canvas.draw()
+        ax, canvas, line, fill, y = graph["ax"], graph["canvas"], graph["line"], graph["fill"], graph["y"]
+        n, head = self._buf_n, self._buf_head
+        if n < CHART_WINDOW: y[CHART_WINDOW - n:] = buf[:n]  # Not wrapped yet: head == n
+        else: y[:CHART_WINDOW - head] = buf[head:]; y[CHART_WINDOW - head:] = buf[:head]
+        line.set_ydata(y)
+        verts = graph["verts"]; verts[:CHART_WINDOW, 1] = y
+        fill.set_verts([verts[CHART_WINDOW - n:CHART_WINDOW + n]])
+
+        if graph["bg"] is None:
+            canvas.draw_idle()
+        else:
+            canvas.restore_region(graph["bg"])
+            ax.draw_artist(fill); ax.draw_artist(line)
+            canvas.blit(graph["fig"].bbox)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
     app = SmartHomeApp()
-    app.mainloop()
\ No newline at end of file
+    app.mainloop()